@@ -1,12 +1,18 @@
-﻿from flask import Flask, request, jsonify
+﻿from flask import Flask, request
 from flask_cors import CORS
 import json
 import time
 import threading
-from collections import OrderedDict
+import functools
+import heapq
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import random
 import math
 import os
+import multiprocessing
+import orjson
 
 app = Flask(__name__)
 prod_origin = os.environ.get('APP_URL')
@@ -21,6 +27,11 @@ if prod_origin:
 
 CORS(app, origins=allowed_origins)
 
+def json_response(payload, status=200):
+    # orjson is much faster than the stdlib encoder behind jsonify, and
+    # OPT_NON_STR_KEYS lets int-keyed dicts go out without str() conversion
+    return app.response_class(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), status=status, mimetype='application/json')
+
 class VirtualMemorySimulator:
     def __init__(self, physical_frames=20, page_size=4096, virtual_pages=32):
         self.physical_frames = physical_frames
@@ -30,26 +41,36 @@ class VirtualMemorySimulator:
         self.physical_memory = [None] * physical_frames
         self.free_frames = list(range(physical_frames))
         self.processes = {}
+        self.resident_pages = {}
         self.current_pid = 1
+        self.tick = 0
+        self.state_version = 0
+        self.json_cache = {}
         
         self.stats = {
             'page_faults': 0,
             'memory_accesses': 0,
             'hit_ratio': 0.0,
             'algorithm_stats': {},
-            'page_fault_history': [],
-            'access_history': [],
+            'page_fault_history': deque(maxlen=200),
+            'access_history': deque(maxlen=200),
             'working_set_sizes': {},
             'thrashing_detected': False
         }
+        self.recent_fault_window = deque(maxlen=20)
+        self.recent_fault_count = 0
         
         self.current_algorithm = 'FIFO'
-        self.fifo_queue = []
-        self.lru_access_order = {}
+        self.fifo_queue = deque()
+        self.lru_access_order = OrderedDict()
         self.clock_pointer = 0
-        self.clock_bits = {}
+        self.clock_bits = bytearray(physical_frames)
         
         self.tlb = OrderedDict()
+        self.tlb_dirty = True
+        self.tlb_cache = None
+        self.last_tlb_key = None
+        self.last_tlb_frame = None
         self.tlb_hits = 0
         self.tlb_misses = 0
         self.tlb_size = 4
@@ -61,121 +82,133 @@ class VirtualMemorySimulator:
             'Optimal': {'page_faults': 0, 'accesses': 0}
         }
 
-    def _make_key(self, pid, page):
-        return f"{pid}_{page}"
-
-    def _parse_key(self, key):
-        parts = key.split('_')
-        return int(parts[0]), int(parts[1])
-        
     def create_process(self, pid, pages_needed):
-        if str(pid) in self.processes:
+        if pid in self.processes:
             return False
             
         if pages_needed > self.physical_frames:
             pages_needed = self.physical_frames
             
-        page_table = {}
+        page_table = []
         allocated_pages = min(pages_needed, len(self.free_frames))
         
         for i in range(allocated_pages):
             if self.free_frames:
-                frame = self.free_frames.pop(0)
-                page_table[str(i)] = {
+                frame = heapq.heappop(self.free_frames)
+                # Each preloaded page gets its own tick so load and access
+                # order stay strict when set_algorithm rebuilds FIFO or LRU
+                self.tick += 1
+                page_table.append({
                     'frame': frame,
                     'valid': True,
                     'dirty': False,
                     'referenced': True,
-                    'access_time': time.time(),
-                    'load_time': time.time()
-                }
+                    'access_time': self.tick,
+                    'load_time': self.tick
+                })
                 self.physical_memory[frame] = {'pid': pid, 'page': i}
                 
-                key = self._make_key(pid, i)
+                key = (pid, i)
+                self.resident_pages[key] = frame
                 if self.current_algorithm == 'FIFO':
                     self.fifo_queue.append((pid, i, frame))
                 elif self.current_algorithm == 'Clock':
-                    self.clock_bits[key] = 1
+                    self.clock_bits[frame] = 1
                 elif self.current_algorithm == 'LRU':
-                    self.lru_access_order[key] = time.time()
+                    self.lru_access_order[key] = None
                     
         for i in range(allocated_pages, pages_needed):
-            page_table[str(i)] = {
+            page_table.append({
                 'frame': None,
                 'valid': False,
                 'dirty': False,
                 'referenced': False,
                 'access_time': None,
                 'load_time': None
-            }
+            })
             
-        self.processes[str(pid)] = {
+        self.processes[pid] = {
             'page_table': page_table,
             'pages_needed': pages_needed,
             'allocated_pages': allocated_pages,
-            'working_set': [],
-            'recent_accesses': [],
+            'working_set': {},
             'creation_time': time.time()
         }
         
-        self.stats['working_set_sizes'][str(pid)] = 0
+        self.stats['working_set_sizes'][pid] = 0
+        self.state_version += 1
         return True
         
     def terminate_process(self, pid):
-        pid_str = str(pid)
-        if pid_str not in self.processes:
+        process = self.processes.get(pid)
+        if process is None:
             return False
             
-        process = self.processes[pid_str]
-        
         if self.current_algorithm == 'FIFO':
-            self.fifo_queue = [(p, pg, f) for p, pg, f in self.fifo_queue if p != pid]
+            # Rotate through the queue once, re-appending the entries we keep
+            for _ in range(len(self.fifo_queue)):
+                entry = self.fifo_queue.popleft()
+                if entry[0] != pid:
+                    self.fifo_queue.append(entry)
 
-        for page_num_str, page_entry in process['page_table'].items():
-            page_num = int(page_num_str)
+        for page_num, page_entry in enumerate(process['page_table']):
             if page_entry['valid']:
                 frame = page_entry['frame']
                 self.physical_memory[frame] = None
-                self.free_frames.append(frame)
+                heapq.heappush(self.free_frames, frame)
                 
-                key = self._make_key(pid, page_num)
+                key = (pid, page_num)
+                del self.resident_pages[key]
                 if self.current_algorithm == 'LRU':
                     if key in self.lru_access_order:
                         del self.lru_access_order[key]
                 elif self.current_algorithm == 'Clock':
-                    if key in self.clock_bits:
-                        del self.clock_bits[key]
+                    self.clock_bits[frame] = 0
                         
         self.clear_tlb_for_process(pid)
-        del self.processes[pid_str]
-        if pid_str in self.stats['working_set_sizes']:
-            del self.stats['working_set_sizes'][pid_str]
-        self.free_frames.sort()
+        del self.processes[pid]
+        self.stats['working_set_sizes'].pop(pid, None)
+        self.state_version += 1
         return True
 
-    def translate_address(self, pid, virtual_address, future_accesses=None):
-        pid_str = str(pid)
-        if pid_str not in self.processes:
+    def translate_address(self, pid, virtual_address, future_accesses=None, trace=False):
+        process = self.processes.get(pid)
+        if process is None:
             return None, "Process not found"
             
         page_number = virtual_address // self.page_size
         offset = virtual_address % self.page_size
         
-        if page_number >= self.processes[pid_str]['pages_needed']:
+        if not 0 <= page_number < process['pages_needed']:
             return None, "Segmentation fault: Address out of bounds"
             
-        self.stats['memory_accesses'] += 1
-        if self.current_algorithm in self.performance_comparison:
-            self.performance_comparison[self.current_algorithm]['accesses'] += 1
-        
-        tlb_key = self._make_key(pid, page_number)
-        if tlb_key in self.tlb:
+        self.tick += 1
+        self.state_version += 1
+        current_time = time.time()
+        stats = self.stats
+        stats['memory_accesses'] += 1
+        perf = self.performance_comparison.get(self.current_algorithm)
+        if perf is not None:
+            perf['accesses'] += 1
+        
+        page_table = process['page_table']
+        tlb_key = (pid, page_number)
+        if tlb_key == self.last_tlb_key:
+            # Repeat of the previous translation: already the MRU TLB entry
+            frame = self.last_tlb_frame
+        else:
+            frame = self.tlb.get(tlb_key)
+            if frame is not None:
+                self.tlb.move_to_end(tlb_key)
+                self.tlb_dirty = True
+                self.last_tlb_key, self.last_tlb_frame = tlb_key, frame
+        if frame is not None:
             self.tlb_hits += 1
-            frame = self.tlb[tlb_key]
-            self.tlb.move_to_end(tlb_key)
             physical_address = frame * self.page_size + offset
-            self.update_access_info(pid, page_number)
-            self.record_access(pid, page_number, False, True)
+            self.update_access_info(pid, page_number, page_table[page_number])
+            self.record_access(pid, page_number, False, True, current_time)
+            if not trace:
+                return {'physical_address': physical_address, 'frame': frame, 'page_fault': False, 'tlb_hit': True, 'translation_steps': None}, None
             return {
                 'physical_address': physical_address, 'frame': frame, 'page_fault': False, 'tlb_hit': True,
                 'translation_steps': [
@@ -185,87 +218,92 @@ class VirtualMemorySimulator:
             }, None
         
         self.tlb_misses += 1
-        page_table = self.processes[pid_str]['page_table']
+        page_entry = page_table[page_number]
         
-        if str(page_number) not in page_table:
-             return None, "Segmentation fault: Page not in page table"
-
-        page_entry = page_table[str(page_number)]
-        
-        translation_steps = [
-            {'step': 'tlb_lookup', 'description': f'TLB Miss for page {page_number}.'},
-            {'step': 'page_table_lookup', 'description': f'Checking page table for page {page_number}.'}
-        ]
+        translation_steps = None
+        if trace:
+            translation_steps = [
+                {'step': 'tlb_lookup', 'description': f'TLB Miss for page {page_number}.'},
+                {'step': 'page_table_lookup', 'description': f'Checking page table for page {page_number}.'}
+            ]
         
         page_faulted = False
         if not page_entry['valid']:
-            self.stats['page_faults'] += 1
-            if self.current_algorithm in self.performance_comparison:
-                self.performance_comparison[self.current_algorithm]['page_faults'] += 1
-            translation_steps.append({'step': 'page_fault', 'description': f'Page Fault for page {page_number}.'})
+            stats['page_faults'] += 1
+            if perf is not None:
+                perf['page_faults'] += 1
             page_faulted = True
             
-            fault_info = self.handle_page_fault(pid, page_number, future_accesses)
-            translation_steps.extend(fault_info['steps'])
-            page_entry = self.processes[pid_str]['page_table'][str(page_number)]
-            self.record_access(pid, page_number, True, False)
+            fault_info = self.handle_page_fault(pid, page_number, page_entry, future_accesses, trace)
+            if trace:
+                translation_steps.append({'step': 'page_fault', 'description': f'Page Fault for page {page_number}.'})
+                translation_steps.extend(fault_info['steps'])
+            self.record_access(pid, page_number, True, False, current_time)
             
         if page_entry['valid']:
-            self.update_access_info(pid, page_number)
-            self.update_tlb(pid, page_number, page_entry['frame'])
+            frame = page_entry['frame']
+            self.update_access_info(pid, page_number, page_entry)
+            self.update_tlb(pid, page_number, frame)
             
-            physical_address = page_entry['frame'] * self.page_size + offset
+            physical_address = frame * self.page_size + offset
             self.update_hit_ratio()
-            self.update_working_set(pid, page_number)
+            self.update_working_set(pid, page_number, current_time)
             self.detect_thrashing()
             
-            translation_steps.append({
-                'step': 'address_calculation', 
-                'description': f'Physical Address = (Frame {page_entry["frame"]} * {self.page_size}) + {offset} = {physical_address}'
-            })
+            if trace:
+                translation_steps.append({
+                    'step': 'address_calculation', 
+                    'description': f'Physical Address = (Frame {frame} * {self.page_size}) + {offset} = {physical_address}'
+                })
             
             if not page_faulted:
-                self.record_access(pid, page_number, False, False)
+                self.record_access(pid, page_number, False, False, current_time)
             
             return {
-                'physical_address': physical_address, 'frame': page_entry['frame'],
+                'physical_address': physical_address, 'frame': frame,
                 'page_fault': page_faulted, 'tlb_hit': False,
                 'translation_steps': translation_steps
             }, None
             
         return None, "Failed to handle page fault"
 
-    def handle_page_fault(self, pid, page_number, future_accesses=None):
+    def handle_page_fault(self, pid, page_number, page_entry, future_accesses=None, trace=False):
         steps = []
         
         if not self.free_frames:
             victim_info = self.select_victim_page(pid, future_accesses)
             if victim_info:
-                evict_steps = self.evict_page(victim_info)
+                evict_steps = self.evict_page(victim_info, trace)
                 steps.extend(evict_steps)
             else:
-                steps.append({'step': 'error', 'description': 'No victim page could be selected.'})
+                if trace:
+                    steps.append({'step': 'error', 'description': 'No victim page could be selected.'})
                 return {'steps': steps}
                 
         if self.free_frames:
-            frame = self.free_frames.pop(0)
+            frame = heapq.heappop(self.free_frames)
             
-            self.processes[str(pid)]['page_table'][str(page_number)].update({
+            page_entry.update({
                 'frame': frame, 'valid': True, 'dirty': False, 'referenced': True,
-                'access_time': time.time(), 'load_time': time.time()
+                'access_time': self.tick, 'load_time': self.tick
             })
             
             self.physical_memory[frame] = {'pid': pid, 'page': page_number}
             
-            key = self._make_key(pid, page_number)
-            if self.current_algorithm == 'FIFO':
+            key = (pid, page_number)
+            self.resident_pages[key] = frame
+            algorithm = self.current_algorithm
+            if algorithm == 'FIFO':
                 self.fifo_queue.append((pid, page_number, frame))
-            elif self.current_algorithm == 'Clock':
-                self.clock_bits[key] = 1
-            elif self.current_algorithm == 'LRU':
-                self.lru_access_order[key] = time.time()
+            elif algorithm == 'Clock':
+                self.clock_bits[frame] = 1
+            elif algorithm == 'LRU':
+                lru_access_order = self.lru_access_order
+                lru_access_order[key] = None
+                lru_access_order.move_to_end(key)
                 
-            steps.append({'step': 'page_load', 'description': f'Loaded page {page_number} of process {pid} into frame {frame}.'})
+            if trace:
+                steps.append({'step': 'page_load', 'description': f'Loaded page {page_number} of process {pid} into frame {frame}.'})
             
         return {'steps': steps}
 
@@ -282,163 +320,185 @@ class VirtualMemorySimulator:
         
     def select_fifo_victim(self):
         if self.fifo_queue:
-            pid, page_num, frame = self.fifo_queue.pop(0)
+            pid, page_num, frame = self.fifo_queue.popleft()
             return {'frame': frame, 'pid': pid, 'page': page_num, 'reason': 'Selected oldest page from FIFO queue.'}
         return None
         
     def select_lru_victim(self):
-        if self.lru_access_order:
-            oldest_key = min(self.lru_access_order, key=self.lru_access_order.get)
-            pid, page_num = self._parse_key(oldest_key)
-            pid_str = str(pid)
-            if pid_str in self.processes and str(page_num) in self.processes[pid_str]['page_table']:
-                page_entry = self.processes[pid_str]['page_table'][str(page_num)]
-                if page_entry['valid']:
-                    del self.lru_access_order[oldest_key]
-                    return {'frame': page_entry['frame'], 'pid': pid, 'page': page_num, 'reason': 'Selected least recently used (LRU) page.'}
+        while self.lru_access_order:
+            key, _ = self.lru_access_order.popitem(last=False)
+            frame = self.resident_pages.get(key)
+            if frame is not None:
+                pid, page_num = key
+                return {'frame': frame, 'pid': pid, 'page': page_num, 'reason': 'Selected least recently used (LRU) page.'}
         return None
         
     def select_clock_victim(self):
-        start_pointer = self.clock_pointer
-        while True:
-            frame_info = self.physical_memory[self.clock_pointer]
-            if frame_info:
-                pid, page_num = frame_info['pid'], frame_info['page']
-                key = self._make_key(pid, page_num)
-                
-                if self.clock_bits.get(key, 0) == 0:
-                    victim_frame = self.clock_pointer
-                    self.clock_pointer = (self.clock_pointer + 1) % self.physical_frames
-                    if key in self.clock_bits: del self.clock_bits[key]
-                    return {'frame': victim_frame, 'pid': pid, 'page': page_num, 'reason': f'Found page with reference bit 0 at frame {victim_frame}.'}
-                else:
-                    self.clock_bits[key] = 0
+        if not self.resident_pages:
+            return None
             
-            self.clock_pointer = (self.clock_pointer + 1) % self.physical_frames
-            if self.clock_pointer == start_pointer:
-                return self.select_fifo_victim()
+        # bytearray.find scans for the next clear reference bit in C; every
+        # set bit the hand passes on the way is cleared with one slice write
+        bits = self.clock_bits
+        pointer = self.clock_pointer
+        while True:
+            victim_frame = bits.find(0, pointer)
+            if victim_frame == -1:
+                bits[pointer:] = bytes(self.physical_frames - pointer)
+                pointer = 0
+                continue
+            bits[pointer:victim_frame] = bytes(victim_frame - pointer)
+            pointer = victim_frame + 1
+            self.clock_pointer = pointer % self.physical_frames
+            frame_info = self.physical_memory[victim_frame]
+            if frame_info is None:
+                continue
+            return {'frame': victim_frame, 'pid': frame_info['pid'], 'page': frame_info['page'], 'reason': f'Found page with reference bit 0 at frame {victim_frame}.'}
         
     def select_optimal_victim(self, future_accesses):
-        if not future_accesses:
-            return self.select_fifo_victim()
-
-        pages_in_memory = [pm for pm in self.physical_memory if pm is not None]
-        
-        future_use = {}
-        for mem_page in pages_in_memory:
-            key = self._make_key(mem_page['pid'], mem_page['page'])
-            try:
-                next_use = next(i for i, (p, pg) in enumerate(future_accesses) if p == mem_page['pid'] and pg == mem_page['page'])
-                future_use[key] = next_use
-            except StopIteration:
-                frame_idx = self.processes[str(mem_page['pid'])]['page_table'][str(mem_page['page'])]['frame']
-                return {'frame': frame_idx, 'pid': mem_page['pid'], 'page': mem_page['page'], 'reason': 'Page will not be used again in the future.'}
+        if not self.resident_pages:
+            return None
 
-        if not future_use:
-            return self.select_fifo_victim()
-            
-        victim_key = max(future_use, key=future_use.get)
-        pid, page = self._parse_key(victim_key)
-        frame_idx = self.processes[str(pid)]['page_table'][str(page)]['frame']
-        return {'frame': frame_idx, 'pid': pid, 'page': page, 'reason': f'Page is used furthest in the future at step {future_use[victim_key]}.'}
-        
-    def evict_page(self, victim_info):
+        if not future_accesses:
+            # resident_pages keeps load order, so its first key is the FIFO choice
+            (pid, page), frame_idx = next(iter(self.resident_pages.items()))
+            return {'frame': frame_idx, 'pid': pid, 'page': page, 'reason': 'No future accesses known; selected oldest loaded page.'}
+
+        next_use = {}
+        for i in range(len(future_accesses) - 1, -1, -1):
+            next_use[future_accesses[i]] = i
+
+        victim_key, victim_step = None, -1
+        for key, frame_idx in self.resident_pages.items():
+            step = next_use.get(key)
+            if step is None:
+                pid, page = key
+                return {'frame': frame_idx, 'pid': pid, 'page': page, 'reason': 'Page will not be used again in the future.'}
+            if step > victim_step:
+                victim_key, victim_step = key, step
+
+        pid, page = victim_key
+        frame_idx = self.resident_pages[victim_key]
+        return {'frame': frame_idx, 'pid': pid, 'page': page, 'reason': f'Page is used furthest in the future at step {victim_step}.'}
+        
+    def evict_page(self, victim_info, trace=False):
         steps = []
         frame = victim_info['frame']
         pid = victim_info['pid']
         page_num = victim_info['page']
         
-        steps.append({'step': 'victim_selection', 'description': victim_info.get('reason', f'Evicting page {page_num} of P{pid} from frame {frame}.')})
+        if trace:
+            steps.append({'step': 'victim_selection', 'description': victim_info.get('reason', f'Evicting page {page_num} of P{pid} from frame {frame}.')})
         
-        pid_str = str(pid)
-        if pid_str in self.processes:
-            page_entry = self.processes[pid_str]['page_table'][str(page_num)]
-            if page_entry.get('dirty', False):
+        if pid in self.processes:
+            page_entry = self.processes[pid]['page_table'][page_num]
+            if trace and page_entry.get('dirty', False):
                 steps.append({'step': 'write_back', 'description': f'Writing dirty page {page_num} back to disk.'})
             
             page_entry['valid'] = False
             page_entry['frame'] = None
             
         self.physical_memory[frame] = None
-        self.free_frames.append(frame)
-        self.free_frames.sort()
+        heapq.heappush(self.free_frames, frame)
+        self.resident_pages.pop((pid, page_num), None)
         
         self.clear_tlb_entry(pid, page_num)
         
         return steps
         
-    def update_access_info(self, pid, page_number):
-        current_time = time.time()
-        key = self._make_key(pid, page_number)
-        
-        if self.current_algorithm == 'LRU':
-            self.lru_access_order[key] = current_time
-        elif self.current_algorithm == 'Clock':
-            self.clock_bits[key] = 1
+    def update_access_info(self, pid, page_number, page_entry):
+        algorithm = self.current_algorithm
+        if algorithm == 'LRU':
+            key = (pid, page_number)
+            lru_access_order = self.lru_access_order
+            lru_access_order[key] = None
+            lru_access_order.move_to_end(key)
+        elif algorithm == 'Clock':
+            self.clock_bits[page_entry['frame']] = 1
             
-        pid_str = str(pid)
-        if pid_str in self.processes and str(page_number) in self.processes[pid_str]['page_table']:
-            self.processes[pid_str]['page_table'][str(page_number)]['access_time'] = current_time
-            self.processes[pid_str]['page_table'][str(page_number)]['referenced'] = True
+        page_entry['access_time'] = self.tick
+        page_entry['referenced'] = True
             
     def update_tlb(self, pid, page_number, frame):
-        tlb_key = self._make_key(pid, page_number)
+        tlb_key = (pid, page_number)
         if tlb_key in self.tlb:
             del self.tlb[tlb_key]
         self.tlb[tlb_key] = frame
+        self.tlb_dirty = True
+        self.last_tlb_key, self.last_tlb_frame = tlb_key, frame
         
         if len(self.tlb) > self.tlb_size:
-            self.tlb.popitem(last=False)
+            evicted_key, _ = self.tlb.popitem(last=False)
+            if evicted_key == self.last_tlb_key:
+                self.last_tlb_key = None
             
     def clear_tlb_for_process(self, pid):
-        keys_to_remove = [k for k in self.tlb if k.startswith(f"{pid}_")]
+        keys_to_remove = [k for k in self.tlb if k[0] == pid]
         for key in keys_to_remove:
             del self.tlb[key]
+        if keys_to_remove:
+            self.tlb_dirty = True
+        if self.last_tlb_key is not None and self.last_tlb_key[0] == pid:
+            self.last_tlb_key = None
             
     def clear_tlb_entry(self, pid, page_number):
-        tlb_key = self._make_key(pid, page_number)
+        tlb_key = (pid, page_number)
         if tlb_key in self.tlb:
             del self.tlb[tlb_key]
-            
-    def update_working_set(self, pid, page_number):
-        pid_str = str(pid)
-        if pid_str not in self.processes:
+            self.tlb_dirty = True
+        if tlb_key == self.last_tlb_key:
+            self.last_tlb_key = None
+
+    def get_tlb_entries(self):
+        if self.tlb_dirty:
+            self.tlb_cache = {f"{pid}_{page}": frame for (pid, page), frame in self.tlb.items()}
+            self.tlb_dirty = False
+        return self.tlb_cache
+            
+    def update_working_set(self, pid, page_number, current_time):
+        if pid not in self.processes:
             return
             
-        current_time = time.time()
         window_size = 10.0
         
-        process = self.processes[pid_str]
-        process['recent_accesses'].append((page_number, current_time))
-        process['recent_accesses'] = [(p, t) for p, t in process['recent_accesses'] if current_time - t <= window_size]
-        process['working_set'] = list(set(p for p, t in process['recent_accesses']))
-        self.stats['working_set_sizes'][pid_str] = len(process['working_set'])
+        # working_set maps page -> last access time, oldest first, so it never
+        # holds more than pages_needed entries however many accesses arrive
+        working_set = self.processes[pid]['working_set']
+        working_set.pop(page_number, None)
+        working_set[page_number] = current_time
+        
+        while True:
+            oldest = next(iter(working_set))
+            if current_time - working_set[oldest] <= window_size:
+                break
+            del working_set[oldest]
+                
+        self.stats['working_set_sizes'][pid] = len(working_set)
         
     def detect_thrashing(self):
-        history = self.stats.get('page_fault_history', [])
-        if len(history) < 20:
+        window = self.recent_fault_window
+        if len(window) < window.maxlen:
             self.stats['thrashing_detected'] = False
             return
             
-        recent_fault_count = sum(1 for f in history[-20:])
-        self.stats['thrashing_detected'] = recent_fault_count > 10
+        self.stats['thrashing_detected'] = self.recent_fault_count > 10
 
-    def record_access(self, pid, page_number, was_fault, was_tlb_hit):
-        current_time = time.time()
+    def record_access(self, pid, page_number, was_fault, was_tlb_hit, current_time):
         self.stats['access_history'].append({
             'pid': pid, 'page': page_number, 'time': current_time, 'fault': was_fault, 'tlb_hit': was_tlb_hit
         })
         
+        window = self.recent_fault_window
+        if len(window) == window.maxlen:
+            self.recent_fault_count -= window[0]
+        window.append(1 if was_fault else 0)
+        self.recent_fault_count += window[-1]
+        
         if was_fault:
             self.stats['page_fault_history'].append({
                 'pid': pid, 'page': page_number, 'time': current_time, 'algorithm': self.current_algorithm
             })
             
-        if len(self.stats['access_history']) > 200:
-            self.stats['access_history'] = self.stats['access_history'][-100:]
-        if len(self.stats['page_fault_history']) > 200:
-            self.stats['page_fault_history'] = self.stats['page_fault_history'][-100:]
-            
     def update_hit_ratio(self):
         if self.stats['memory_accesses'] > 0:
             hits = self.stats['memory_accesses'] - self.stats['page_faults']
@@ -474,7 +534,7 @@ class VirtualMemorySimulator:
             'thrashing_detected': self.stats.get('thrashing_detected', False),
             'process_info': {pid: {
                 'pages_allocated': proc['allocated_pages'], 'pages_needed': proc['pages_needed'],
-                'working_set_size': len(proc.get('working_set', []))
+                'working_set_size': len(proc['working_set'])
             } for pid, proc in self.processes.items()}
         }
         
@@ -487,46 +547,250 @@ class VirtualMemorySimulator:
                 'allocated_pages': proc['allocated_pages'],
                 'working_set_size': self.stats['working_set_sizes'].get(pid, 0)
             } for pid, proc in self.processes.items()},
-            'free_frames': self.free_frames, 'stats': self.stats,
-            'current_algorithm': self.current_algorithm, 'tlb': dict(self.tlb),
+            'free_frames': sorted(self.free_frames),
+            'stats': {
+                **self.stats,
+                'access_history': list(self.stats['access_history']),
+                'page_fault_history': list(self.stats['page_fault_history'])
+            },
+            'current_algorithm': self.current_algorithm, 'tlb': self.get_tlb_entries(),
             'tlb_stats': {
                 'hits': self.tlb_hits, 'misses': self.tlb_misses,
                 'hit_ratio': self.tlb_hits / total_tlb_lookups if total_tlb_lookups > 0 else 0
             }
         }
 
+    def get_cached_json(self, name, build):
+        # Polling clients often ask again before anything has changed, so each
+        # GET's encoded body is reused until the next mutation bumps state_version
+        cached = self.json_cache.get(name)
+        if cached is None or cached[0] != self.state_version:
+            cached = (self.state_version, orjson.dumps(build(), option=orjson.OPT_NON_STR_KEYS))
+            self.json_cache[name] = cached
+        return cached[1]
+
+    def get_memory_delta(self, changed_frames):
+        total_tlb_lookups = self.tlb_hits + self.tlb_misses
+        return {
+            'frames': {frame: self.physical_memory[frame] for frame in changed_frames},
+            'free_frames': len(self.free_frames),
+            'stats': {
+                'page_faults': self.stats['page_faults'], 'memory_accesses': self.stats['memory_accesses'],
+                'hit_ratio': self.stats['hit_ratio'], 'thrashing_detected': self.stats['thrashing_detected']
+            },
+            'current_algorithm': self.current_algorithm,
+            'tlb_stats': {
+                'hits': self.tlb_hits, 'misses': self.tlb_misses,
+                'hit_ratio': self.tlb_hits / total_tlb_lookups if total_tlb_lookups > 0 else 0
+            }
+        }
+
+def prepare_comparison(sequences, frames, page_size, pages_per_process=32):
+    # Mirrors a fresh simulator: each process is created in pid order with its
+    # first pages preloaded, and out-of-bounds accesses are never counted
+    pages_per_process = min(pages_per_process, frames)
+    preloaded = []
+    for pid in sorted(set(pid for pid, addr in sequences)):
+        for page in range(min(pages_per_process, frames - len(preloaded))):
+            preloaded.append((pid, page))
+    accesses = [(pid, addr // page_size) for pid, addr in sequences if 0 <= addr // page_size < pages_per_process]
+    return accesses, preloaded
+
+def count_faults_fifo(accesses, frames, preloaded):
+    queue = deque(preloaded)
+    resident = set(preloaded)
+    faults = 0
+    for key in accesses:
+        if key in resident:
+            continue
+        faults += 1
+        if len(resident) >= frames:
+            resident.discard(queue.popleft())
+        queue.append(key)
+        resident.add(key)
+    return faults
+
+def count_faults_lru(accesses, frames, preloaded):
+    order = OrderedDict.fromkeys(preloaded)
+    faults = 0
+    for key in accesses:
+        if key in order:
+            order.move_to_end(key)
+            continue
+        faults += 1
+        if len(order) >= frames:
+            order.popitem(last=False)
+        order[key] = None
+    return faults
+
+def count_faults_clock(accesses, frames, preloaded):
+    slots = list(preloaded) + [None] * (frames - len(preloaded))
+    where = {key: slot for slot, key in enumerate(preloaded)}
+    bits = bytearray(frames)
+    bits[:len(preloaded)] = b'\x01' * len(preloaded)
+    pointer = 0
+    faults = 0
+    for key in accesses:
+        slot = where.get(key)
+        if slot is not None:
+            bits[slot] = 1
+            continue
+        faults += 1
+        if len(where) < frames:
+            slot = len(where)
+        else:
+            while bits[pointer]:
+                bits[pointer] = 0
+                pointer = (pointer + 1) % frames
+            slot = pointer
+            pointer = (pointer + 1) % frames
+            del where[slots[slot]]
+        slots[slot] = key
+        where[key] = slot
+        bits[slot] = 1
+    return faults
+
+def count_faults_optimal(accesses, frames, preloaded):
+    never = len(accesses)
+    next_use = [never] * len(accesses)
+    seen = {}
+    for i in range(len(accesses) - 1, -1, -1):
+        next_use[i] = seen.get(accesses[i], never)
+        seen[accesses[i]] = i
+
+    # resident maps each page to its next use. The heap holds (-next_use, seq,
+    # page) for every update; entries whose next use has since changed are
+    # stale and skipped when popped, so a victim costs O(log n), not O(frames)
+    resident = {}
+    heap = []
+    for seq, key in enumerate(preloaded):
+        resident[key] = seen.get(key, never)
+        heap.append((-resident[key], seq - len(preloaded), key))
+    heapq.heapify(heap)
+    faults = 0
+    for i, key in enumerate(accesses):
+        if key not in resident:
+            faults += 1
+            if len(resident) >= frames:
+                while True:
+                    negative_use, _, victim = heapq.heappop(heap)
+                    if resident.get(victim) == -negative_use:
+                        del resident[victim]
+                        break
+        resident[key] = next_use[i]
+        heapq.heappush(heap, (-next_use[i], i, key))
+    return faults
+
+FAULT_COUNTERS = {
+    'FIFO': count_faults_fifo,
+    'LRU': count_faults_lru,
+    'Clock': count_faults_clock,
+    'Optimal': count_faults_optimal
+}
+
+# Placeholder: only measured on a single-core host, where the pool never wins.
+# Below this many accesses, starting workers and pickling the trace should cost
+# more than running the four policies back to back; retune on a multi-core host
+PARALLEL_COMPARE_MIN_ACCESSES = 500000
+
+def run_policy(algorithm, page_accesses, frames, preloaded):
+    try:
+        faults = FAULT_COUNTERS[algorithm](page_accesses, frames, preloaded)
+    except Exception as e:
+        return algorithm, {'error': str(e)}
+    accesses = len(page_accesses)
+    return algorithm, {
+        'page_faults': faults, 'accesses': accesses,
+        'hit_ratio': (accesses - faults) / accesses if accesses > 0 else 0.0,
+        'fault_rate': faults / accesses if accesses > 0 else 0
+    }
+
+def compare_policies(algorithms, page_accesses, frames, preloaded):
+    if len(page_accesses) >= PARALLEL_COMPARE_MIN_ACCESSES and (os.cpu_count() or 1) > 1:
+        try:
+            # spawn, not fork: the server runs threaded, and a forked child can
+            # inherit locks held by other request threads
+            with ProcessPoolExecutor(max_workers=len(algorithms), mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(run_policy, algorithm, page_accesses, frames, preloaded) for algorithm in algorithms]
+                return dict(future.result() for future in futures)
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # Some hosts (e.g. serverless runtimes) cannot start worker processes
+            pass
+    return dict(run_policy(algorithm, page_accesses, frames, preloaded) for algorithm in algorithms)
+
 simulator = VirtualMemorySimulator()
+simulator_lock = threading.Lock()
+
+def with_simulator_lock(view):
+    # gunicorn runs threaded workers against the one shared simulator, and
+    # responses are encoded from live state, so the whole view holds the lock
+    @functools.wraps(view)
+    def locked_view(*args, **kwargs):
+        with simulator_lock:
+            return view(*args, **kwargs)
+    return locked_view
+
+def cached_json_response(name, build):
+    return app.response_class(simulator.get_cached_json(name, build), mimetype='application/json')
+
+def delta_requested():
+    # Full state by default; clients that track state themselves pass ?full=0
+    return request.args.get('full', '1') == '0'
+
+def memory_state_payload(changed_frames=()):
+    if delta_requested():
+        return {'memory_delta': simulator.get_memory_delta(changed_frames)}
+    return {'memory_state': simulator.get_memory_state()}
+
+def trace_requested(default):
+    # Building translation_steps costs several dicts and f-strings per access,
+    # so batch routes only do it when the caller asks with ?trace=1
+    return request.args.get('trace', '1' if default else '0') == '1'
+
+def frame_snapshot():
+    # Only a ?full=0 delta needs to know which frames a request changed
+    return list(simulator.physical_memory) if delta_requested() else None
+
+def changed_frames_since(snapshot):
+    if snapshot is None:
+        return ()
+    return {i for i, (before, after) in enumerate(zip(snapshot, simulator.physical_memory)) if before is not after}
 
 @app.route('/api/create_process', methods=['POST'])
+@with_simulator_lock
 def create_process_route():
     try:
         data = request.json or {}
-        pid = data.get('pid', simulator.current_pid)
+        pid = int(data.get('pid', simulator.current_pid))
         pages = data.get('pages', 4)
         
+        snapshot = frame_snapshot()
         success = simulator.create_process(pid, pages)
         if success:
             simulator.current_pid = max(simulator.current_pid, pid) + 1
         
-        return jsonify({'success': success, 'memory_state': simulator.get_memory_state()})
+        return json_response({'success': success, **memory_state_payload(changed_frames_since(snapshot))})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/terminate_process', methods=['POST'])
+@with_simulator_lock
 def terminate_process_route():
     try:
         pid = request.json.get('pid')
         if pid is None:
-            return jsonify({'success': False, 'error': 'PID is required.'}), 400
+            return json_response({'success': False, 'error': 'PID is required.'}, 400)
+        snapshot = frame_snapshot()
         success = simulator.terminate_process(int(pid))
         
-        return jsonify({'success': success, 'memory_state': simulator.get_memory_state()})
+        return json_response({'success': success, **memory_state_payload(changed_frames_since(snapshot))})
     except (ValueError, KeyError) as e:
-        return jsonify({'success': False, 'error': 'Invalid PID format or process not found.'}), 400
+        return json_response({'success': False, 'error': 'Invalid PID format or process not found.'}, 400)
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/translate_address', methods=['POST'])
+@with_simulator_lock
 def translate_address_route():
     try:
         data = request.json
@@ -534,69 +798,80 @@ def translate_address_route():
         virtual_address = data.get('virtual_address')
         
         if pid is None or virtual_address is None:
-            return jsonify({'result': None, 'error': 'PID and virtual_address are required.'}), 400
+            return json_response({'result': None, 'error': 'PID and virtual_address are required.'}, 400)
 
-        result, error_msg = simulator.translate_address(int(pid), int(virtual_address))
+        result, error_msg = simulator.translate_address(int(pid), int(virtual_address), trace=trace_requested(True))
         if error_msg:
-             return jsonify({'result': None, 'error': error_msg, 'memory_state': simulator.get_memory_state()}), 400
+             return json_response({'result': None, 'error': error_msg, **memory_state_payload()}, 400)
         
-        return jsonify({'result': result, 'memory_state': simulator.get_memory_state()})
+        return json_response({'result': result, **memory_state_payload({result['frame']})})
     except Exception as e:
-        return jsonify({'result': None, 'error': str(e)}), 500
+        return json_response({'result': None, 'error': str(e)}, 500)
 
 @app.route('/api/set_algorithm', methods=['POST'])
+@with_simulator_lock
 def set_algorithm_route():
     try:
         algorithm = request.json.get('algorithm')
         if algorithm not in ['FIFO', 'LRU', 'Clock', 'Optimal']:
-            return jsonify({'success': False, 'error': 'Invalid algorithm specified.'}), 400
+            return json_response({'success': False, 'error': 'Invalid algorithm specified.'}, 400)
             
         simulator.current_algorithm = algorithm
         simulator.fifo_queue.clear()
         simulator.lru_access_order.clear()
         simulator.clock_pointer = 0
-        simulator.clock_bits.clear()
+        simulator.clock_bits = bytearray(simulator.physical_frames)
         
+        lru_pages = []
         for frame_idx, frame_content in enumerate(simulator.physical_memory):
             if frame_content:
                 pid, page_num = frame_content['pid'], frame_content['page']
-                key = simulator._make_key(pid, page_num)
+                key = (pid, page_num)
                 if algorithm == 'FIFO':
                     simulator.fifo_queue.append((pid, page_num, frame_idx))
                 elif algorithm == 'Clock':
-                    simulator.clock_bits[key] = 1
+                    simulator.clock_bits[frame_idx] = 1
                 elif algorithm == 'LRU':
-                    access_time = simulator.processes[str(pid)]['page_table'][str(page_num)].get('access_time', time.time())
-                    simulator.lru_access_order[key] = access_time
-        
-        if algorithm == 'FIFO':
-             get_load_time = lambda item: simulator.processes[str(item[0])]['page_table'][str(item[1])].get('load_time', 0)
-             simulator.fifo_queue.sort(key=get_load_time)
-
-        return jsonify({'success': True, 'memory_state': simulator.get_memory_state()})
+                    access_time = simulator.processes[pid]['page_table'][page_num].get('access_time') or 0
+                    lru_pages.append((access_time, key))
+        
+        if algorithm == 'LRU':
+            lru_pages.sort()
+            for _, key in lru_pages:
+                simulator.lru_access_order[key] = None
+        elif algorithm == 'FIFO':
+             get_load_time = lambda item: simulator.processes[item[0]]['page_table'][item[1]].get('load_time', 0)
+             simulator.fifo_queue = deque(sorted(simulator.fifo_queue, key=get_load_time))
+        simulator.state_version += 1
+
+        return json_response({'success': True, **memory_state_payload()})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/reset', methods=['POST'])
+@with_simulator_lock
 def reset_simulator_route():
     try:
         global simulator
         simulator = VirtualMemorySimulator()
-        return jsonify({'success': True, 'memory_state': simulator.get_memory_state()})
+        return json_response({'success': True, **memory_state_payload(range(simulator.physical_frames))})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/memory_state', methods=['GET'])
+@with_simulator_lock
 def get_memory_state_route():
     try:
-        return jsonify(simulator.get_memory_state())
+        return cached_json_response('memory_state', simulator.get_memory_state)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 @app.route('/api/run_demo', methods=['POST'])
+@with_simulator_lock
 def run_demo_route():
     try:
         demo_results = []
+        snapshot = frame_snapshot()
         
         if not simulator.processes:
             simulator.create_process(1, 10)
@@ -608,13 +883,14 @@ def run_demo_route():
             (1, 0x5000), (2, 0x4000)
         ]
         
+        trace = trace_requested(False)
         for pid, addr in access_sequence:
-            result, error = simulator.translate_address(pid, addr)
+            result, error = simulator.translate_address(pid, addr, trace=trace)
             demo_results.append({'pid': pid, 'virtual_address': addr, 'result': result, 'error': error})
         
-        return jsonify({ 'success': True, 'memory_state': simulator.get_memory_state(), 'demo_results': demo_results})
+        return json_response({'success': True, **memory_state_payload(changed_frames_since(snapshot)), 'demo_results': demo_results})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/compare_algorithms', methods=['POST'])
 def compare_algorithms_route():
@@ -624,87 +900,65 @@ def compare_algorithms_route():
         frames = data.get('frames', 10)
         
         if not sequences:
-            return jsonify({'success': False, 'error': 'Test sequences are required.'}), 400
+            return json_response({'success': False, 'error': 'Test sequences are required.'}, 400)
             
-        results = {}
         algorithms = ['FIFO', 'LRU', 'Clock', 'Optimal']
         
         page_size = 4096
-        future_page_accesses = [(pid, addr // page_size) for pid, addr in sequences]
-
-        for algorithm in algorithms:
-            try:
-                temp_sim = VirtualMemorySimulator(physical_frames=frames, page_size=page_size)
-                temp_sim.current_algorithm = algorithm
-                
-                pids_in_sequences = sorted(list(set(pid for pid, addr in sequences)))
-                for pid in pids_in_sequences:
-                    temp_sim.create_process(pid, 32)
-                
-                for i, (pid, addr) in enumerate(sequences):
-                    if algorithm == 'Optimal':
-                        remaining_accesses = future_page_accesses[i+1:]
-                        temp_sim.translate_address(pid, addr, future_accesses=remaining_accesses)
-                    else:
-                        temp_sim.translate_address(pid, addr)
-                
-                stats = temp_sim.stats
-                accesses = stats['memory_accesses']
-                faults = stats['page_faults']
-                results[algorithm] = {
-                    'page_faults': faults, 'accesses': accesses,
-                    'hit_ratio': stats['hit_ratio'],
-                    'fault_rate': faults / accesses if accesses > 0 else 0
-                }
-            except Exception as e:
-                results[algorithm] = {'error': str(e)}
+        page_accesses, preloaded = prepare_comparison(sequences, frames, page_size)
+        results = compare_policies(algorithms, page_accesses, frames, preloaded)
         
-        return jsonify({'success': True, 'comparison_results': results})
+        return json_response({'success': True, 'comparison_results': results})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/generate_report', methods=['GET'])
+@with_simulator_lock
 def generate_report_route():
     try:
-        report = simulator.generate_report()
-        return jsonify({'success': True, 'report': report})
+        return cached_json_response('generate_report', lambda: {'success': True, 'report': simulator.generate_report()})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/working_sets', methods=['GET'])
+@with_simulator_lock
 def get_working_sets_route():
     try:
-        working_sets = {}
-        for pid, process in simulator.processes.items():
-            working_sets[pid] = {
-                'size': len(process.get('working_set', [])),
-                'current_set': process.get('working_set', [])
-            }
+        def build():
+            working_sets = {}
+            for pid, process in simulator.processes.items():
+                working_sets[pid] = {
+                    'size': len(process['working_set']),
+                    'current_set': list(process['working_set'])
+                }
+            return {'success': True, 'working_sets': working_sets}
         
-        return jsonify({
-            'success': True,
-            'working_sets': working_sets
-        })
+        return cached_json_response('working_sets', build)
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/tlb_state', methods=['GET'])
+@with_simulator_lock
 def get_tlb_state_route():
     try:
-        total_tlb_lookups = simulator.tlb_hits + simulator.tlb_misses
-        return jsonify({
-            'success': True,
-            'tlb': dict(simulator.tlb),
-            'stats': {
-                'hits': simulator.tlb_hits,
-                'misses': simulator.tlb_misses,
-                'hit_ratio': simulator.tlb_hits / total_tlb_lookups if total_tlb_lookups > 0 else 0
+        def build():
+            total_tlb_lookups = simulator.tlb_hits + simulator.tlb_misses
+            return {
+                'success': True,
+                'tlb': simulator.get_tlb_entries(),
+                'stats': {
+                    'hits': simulator.tlb_hits,
+                    'misses': simulator.tlb_misses,
+                    'hit_ratio': simulator.tlb_hits / total_tlb_lookups if total_tlb_lookups > 0 else 0
+                }
             }
-        })
+        
+        return cached_json_response('tlb_state', build)
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/random_access', methods=['POST'])
+@with_simulator_lock
 def random_access_route():
     try:
         count = int(request.json.get('count', 10))
@@ -712,25 +966,47 @@ def random_access_route():
         pids = list(simulator.processes.keys())
         
         if not pids:
-            return jsonify({'success': False, 'error': 'No active processes to access.'}), 400
+            return json_response({'success': False, 'error': 'No active processes to access.'}, 400)
         
-        for _ in range(count):
-            pid = int(random.choice(pids))
-            process = simulator.processes[str(pid)]
-            max_addr = process['pages_needed'] * simulator.page_size - 1
-            addr = random.randint(0, max_addr)
-            
-            result, error = simulator.translate_address(pid, addr)
+        sampled_pids = random.choices(pids, k=count)
+        address_limits = {pid: simulator.processes[pid]['pages_needed'] * simulator.page_size for pid in set(sampled_pids)}
+        addresses = [random.randrange(address_limits[pid]) for pid in sampled_pids]
+        
+        snapshot = frame_snapshot()
+        translate = simulator.translate_address
+        trace = trace_requested(False)
+        for pid, addr in zip(sampled_pids, addresses):
+            result, error = translate(pid, addr, trace=trace)
             results.append({'pid': pid, 'virtual_address': addr, 'result': result, 'error': error})
         
-        return jsonify({'success': True, 'memory_state': simulator.get_memory_state(), 'access_results': results})
+        return json_response({'success': True, **memory_state_payload(changed_frames_since(snapshot)), 'access_results': results})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/health', methods=['GET'])
 def health_check_route():
-    return jsonify({'status': 'healthy', 'message': 'Virtual memory simulator is running.'})
+    return json_response({'status': 'healthy', 'message': 'Virtual memory simulator is running.'})
+
+def run_gunicorn(port):
+    from gunicorn.app.base import BaseApplication
+
+    class SimulatorServer(BaseApplication):
+        def load_config(self):
+            # The simulator lives in this process, so scale with threads
+            # rather than workers or each worker would get its own state
+            self.cfg.set('bind', f'0.0.0.0:{port}')
+            self.cfg.set('workers', 1)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('threads', int(os.environ.get('GUNICORN_THREADS', 4)))
+
+        def load(self):
+            return app
+
+    SimulatorServer().run()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5001))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    if os.environ.get('WSGI_SERVER') == 'gunicorn':
+        run_gunicorn(port)
+    else:
+        app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file